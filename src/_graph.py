@@ -0,0 +1,82 @@
+# src/_graph.py
+"""
+Shared sparse construction of the author <-> subreddit graph and its author projection.
+- build_edge_index: one groupby over the posts -> integer-coded (author, subreddit[, by]) edges
+- edges_to_csr: CSR biadjacency over all (or a masked subset of) those edges
+- build_bipartite_csr: both steps for the whole DataFrame
+- project_authors / projected_weighted_degree: author-author projection B @ B.T
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def build_edge_index(df, by=None):
+    """Aggregate posts into (author, subreddit[, by]) edges, indexed once.
+    Returns (edges, authors, subs): edges has integer author/subreddit codes "a"/"s", the summed
+    likeCount (if exists, else count) "w" and the `by` column; authors[i] / subs[j] label code i / j."""
+    keys = ["user_username", "subreddit"] + ([by] if by else [])
+    # drop rows without an author/subreddit once, copying only the columns the groupby reads
+    df = df[keys + (["likeCount"] if "likeCount" in df.columns else [])]
+    df = df.dropna(subset=["user_username", "subreddit"])
+    likes = pd.to_numeric(df["likeCount"], errors="coerce").fillna(1.0) if "likeCount" in df.columns else 1.0
+    agg = (df.assign(likeCount=likes)
+             .groupby(keys, sort=False, observed=True)["likeCount"].sum()
+             .reset_index())
+    # category codes are the row/column indices (astype is a no-op for categorical input)
+    authors = agg["user_username"].astype("category").cat.remove_unused_categories()
+    subs = agg["subreddit"].astype("category").cat.remove_unused_categories()
+    edges = pd.DataFrame({
+        "a": authors.cat.codes.to_numpy(),
+        "s": subs.cat.codes.to_numpy(),
+        "w": agg["likeCount"].to_numpy(dtype=float),
+    })
+    if by:
+        edges[by] = agg[by]
+    return edges, np.asarray(authors.cat.categories), np.asarray(subs.cat.categories)
+
+
+def edges_to_csr(edges, authors, subs, mask=None):
+    """Author x Subreddit CSR biadjacency over the edge rows selected by mask (all rows if None).
+    Entries for the same pair are summed; a 0-like edge stays stored as an explicit zero.
+    Authors without an edge are dropped. Returns (B, authors) where authors[i] labels row i of B."""
+    if mask is not None:
+        edges = edges[mask]
+    B = sparse.csr_matrix((edges["w"].to_numpy(), (edges["a"].to_numpy(), edges["s"].to_numpy())),
+                          shape=(len(authors), len(subs)))
+    active = np.flatnonzero(np.diff(B.indptr))
+    return B[active], authors[active]
+
+
+def build_bipartite_csr(df):
+    """Author x Subreddit CSR biadjacency of the whole DataFrame. Entry = sum of likeCount (if exists) else count.
+    Returns (B, authors, subs) labelling the rows and columns of B."""
+    edges, authors, subs = build_edge_index(df)
+    B, authors = edges_to_csr(edges, authors, subs)
+    return B, authors, subs
+
+
+def _pattern(B):
+    """B with every stored entry set to 1 (so 0-like posts still count as an edge)."""
+    A = B.copy()
+    A.data = np.ones_like(A.data)
+    return A
+
+
+def project_authors(B):
+    """Project the biadjacency onto authors (co-posting in same subreddit): P = B @ B.T.
+    Edge weight = number of shared subreddits."""
+    A = _pattern(B)
+    P = (A @ A.T).tocsr()
+    P.setdiag(0)
+    P.eliminate_zeros()
+    return P
+
+
+def projected_weighted_degree(B):
+    """Row sums of project_authors(B) without forming it: A @ (A.T @ 1) - rowsum(A),
+    with A the 0/1 pattern of B, i.e. two sparse mat-vec products."""
+    A = _pattern(B)
+    col_sums = np.asarray(A.sum(axis=0)).ravel()
+    return A @ col_sums - np.asarray(A.sum(axis=1)).ravel()
@@ -0,0 +1,81 @@
+# src/_io.py
+"""
+Shared loader for the processed CSVs in data/processed (expects *_clean.csv).
+- Prefers the <name>_clean.parquet copy written next to each CSV when it is up to date
+- Reads only the columns the analysis scripts use, normalizes their names and
+  stores the author/subreddit/content_type/source_file columns as categoricals
+- Caches the combined DataFrame as data/processed/_combined.parquet; the cache is
+  reused as long as it is newer than every *_clean.csv/.parquet and covers the same files
+"""
+
+from pathlib import Path
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.config import PROC_DIR
+
+CACHE_PATH = Path(PROC_DIR) / "_combined.parquet"
+
+# columns used downstream, under both their raw and normalized names
+USECOLS = {"user_username", "user.username", "subreddit", "likeCount", "like_count", "content_type", "type"}
+# label columns are always strings, so a file whose usernames/subreddits are all numeric
+# doesn't mix int and str categories (which the parquet cache can't write)
+LABELCOLS = {"user_username", "user.username", "subreddit", "content_type", "type"}
+
+
+def _as_labels(s):
+    """Cast a label column read from parquet to str like read_csv(dtype=str) does, keeping NaN;
+    whole-number floats (int columns with gaps) become "1", not "1.0"."""
+    if pd.api.types.is_float_dtype(s) and (s.dropna() % 1 == 0).all():
+        s = s.astype("Int64")
+    return s.astype(str).where(s.notna())
+
+
+def _read_processed(csvs):
+    dfs = []
+    for p in csvs:
+        parquet = p.with_suffix(".parquet")
+        if parquet.exists() and parquet.stat().st_mtime >= p.stat().st_mtime:
+            cols = [c for c in pq.read_schema(parquet).names if c in USECOLS]
+            df = pd.read_parquet(parquet, columns=cols)
+            for c in LABELCOLS & set(cols):
+                df[c] = _as_labels(df[c])
+        else:
+            df = pd.read_csv(p, usecols=lambda c: c in USECOLS, dtype={c: str for c in LABELCOLS})
+        df["source_file"] = p.name
+        dfs.append(df)
+    df = pd.concat(dfs, ignore_index=True)
+    # normalize common column names
+    if "user_username" not in df.columns and "user.username" in df.columns:
+        df = df.rename(columns={"user.username": "user_username"})
+    if "likeCount" not in df.columns and "like_count" in df.columns:
+        df = df.rename(columns={"like_count": "likeCount"})
+    # non-numeric likes become NaN (later counted as weight 1.0) so the parquet cache stays float
+    if "likeCount" in df.columns:
+        df["likeCount"] = pd.to_numeric(df["likeCount"], errors="coerce")
+    if "content_type" not in df.columns:
+        df["content_type"] = df["type"] if "type" in df.columns else "unknown"
+    # blank content_type reads back as NaN from CSV but as "" from parquet
+    df["content_type"] = df["content_type"].where(df["content_type"] != "").fillna("unknown")
+    # categorical keys: groupbys hash int codes and the codes index the sparse matrices directly
+    for c in ("user_username", "subreddit", "content_type"):
+        df[c] = df[c].astype("category")
+    # every input file is a category, even one without rows, so the cache records what it covers
+    df["source_file"] = pd.Categorical(df["source_file"], categories=[p.name for p in csvs])
+    return df
+
+
+def load_combined_df():
+    """Load all processed files as one DataFrame, going through the parquet cache when it is fresh."""
+    csvs = sorted(Path(PROC_DIR).glob("*_clean.csv"))
+    if not csvs:
+        raise SystemExit("No processed CSV files found in data/processed. Run scraper first.")
+    names = {p.name for p in csvs}
+    sources = csvs + [p.with_suffix(".parquet") for p in csvs if p.with_suffix(".parquet").exists()]
+    if CACHE_PATH.exists() and CACHE_PATH.stat().st_mtime > max(p.stat().st_mtime for p in sources):
+        df = pd.read_parquet(CACHE_PATH)
+        if set(df["source_file"].astype("category").cat.categories) == names:
+            return df
+    df = _read_processed(csvs)
+    df.to_parquet(CACHE_PATH, index=False)
+    return df
@@ -1,7 +1,7 @@
 # src/analyze.py
 """
 Compute network metrics and top influencers per content_type.
-- Loads processed CSVs from data/processed (expects *_clean.csv)
+- Loads processed CSVs from data/processed (expects *_clean.csv, cached as parquet)
 - Builds an author<->subreddit bipartite graph and also a projected author-author graph
 - Computes per-category metrics and saves:
     - data/processed/graph_metrics_summary.csv
@@ -10,10 +10,11 @@ Compute network metrics and top influencers per content_type.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
-import networkx as nx
 import numpy as np
+from scipy.sparse import csgraph
 
 # ensure project root is importable when running the script directly
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,86 +22,48 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src.config import PROC_DIR
+from src._io import load_combined_df
+from src._graph import build_edge_index, edges_to_csr, project_authors
 
 OUT_SUMMARY = Path(PROC_DIR) / "graph_metrics_summary.csv"
 OUT_INFLUENCERS = Path(PROC_DIR) / "top_influencers.csv"
 
 
-def load_processed():
-    csvs = list(Path(PROC_DIR).glob("*_clean.csv"))
-    if not csvs:
-        raise SystemExit("No processed CSV files found in data/processed. Run scraper first.")
-    dfs = []
-    for p in csvs:
-        df = pd.read_csv(p)
-        df["source_file"] = p.name
-        dfs.append(df)
-    df = pd.concat(dfs, ignore_index=True)
-    # normalize common column names
-    if "user_username" not in df.columns and "user.username" in df.columns:
-        df = df.rename(columns={"user.username": "user_username"})
-    if "likeCount" not in df.columns and "like_count" in df.columns:
-        df = df.rename(columns={"like_count": "likeCount"})
-    return df
-
-
-def build_bipartite_graph(df):
-    """Author <-> Subreddit bipartite graph. Edge weight = sum of likeCount (if exists) else count."""
-    G = nx.Graph()
-    for _, row in df.iterrows():
-        author = row.get("user_username")
-        subreddit = row.get("subreddit")
-        if pd.isna(author) or pd.isna(subreddit):
-            continue
-        G.add_node(author, bipartite="author")
-        G.add_node(subreddit, bipartite="subreddit")
-        weight = 1.0
-        if "likeCount" in row and not pd.isna(row["likeCount"]):
-            try:
-                weight = float(row["likeCount"])
-            except Exception:
-                weight = 1.0
-        if G.has_edge(author, subreddit):
-            G[author][subreddit]["weight"] += weight
-        else:
-            G.add_edge(author, subreddit, weight=weight)
-    return G
-
-
-def project_authors(G):
-    """Project bipartite graph onto authors (co-posting in same subreddit).
-    Edge weight = number of shared subreddits (or summed weights)."""
-    authors = [n for n, d in G.nodes(data=True) if d.get("bipartite") == "author"]
-    P = nx.bipartite.weighted_projected_graph(G, authors)
-    return P
-
-
-def compute_metrics(G):
+def compute_metrics(P):
+    """Graph metrics for the sparse author projection P (symmetric, zero diagonal)."""
     metrics = {}
-    metrics["n_nodes"] = G.number_of_nodes()
-    metrics["n_edges"] = G.number_of_edges()
-    if G.number_of_nodes() == 0:
+    n = P.shape[0]
+    metrics["n_nodes"] = n
+    metrics["n_edges"] = P.nnz // 2
+    if n == 0:
         metrics.update({
             "avg_degree": 0, "density": 0, "avg_clustering": None,
             "avg_shortest_path": None, "n_components": 0, "largest_component": 0
         })
         return metrics
 
-    degs = [d for _, d in G.degree()]
-    metrics["avg_degree"] = float(np.mean(degs))
-    metrics["density"] = float(nx.density(G))
+    # unweighted adjacency: degree, density and clustering ignore edge weights
+    A = P.copy()
+    A.data = np.ones_like(A.data)
+    degs = np.diff(A.indptr)
+    metrics["avg_degree"] = float(degs.mean())
+    metrics["density"] = float(2 * metrics["n_edges"] / (n * (n - 1))) if n > 1 else 0.0
+    # local clustering = triangles through a node / pairs of its neighbours (0 if degree < 2)
+    triangles = np.asarray(A.multiply(A @ A).sum(axis=1)).ravel() / 2
+    pairs = degs * (degs - 1) / 2
+    clustering = np.divide(triangles, pairs, out=np.zeros(n), where=pairs > 0)
+    metrics["avg_clustering"] = float(clustering.mean())
     try:
-        metrics["avg_clustering"] = float(nx.average_clustering(G))
-    except Exception:
-        metrics["avg_clustering"] = None
-    try:
-        UG = G.to_undirected()
-        comps = list(nx.connected_components(UG))
-        metrics["n_components"] = len(comps)
-        metrics["largest_component"] = int(max(len(c) for c in comps)) if comps else 0
+        # connected components and unweighted shortest paths with scipy.sparse.csgraph
+        n_components, labels = csgraph.connected_components(A, directed=False)
+        sizes = np.bincount(labels)
+        largest = int(sizes.argmax())
+        metrics["n_components"] = int(n_components)
+        metrics["largest_component"] = int(sizes[largest])
         if metrics["largest_component"] > 1:
-            largest = UG.subgraph(max(comps, key=len))
-            metrics["avg_shortest_path"] = float(nx.average_shortest_path_length(largest))
+            idx = np.flatnonzero(labels == largest)
+            D = csgraph.shortest_path(A[idx][:, idx], method="D", directed=False, unweighted=True)
+            metrics["avg_shortest_path"] = float(D[np.isfinite(D) & (D > 0)].mean())
         else:
             metrics["avg_shortest_path"] = None
     except Exception:
@@ -108,59 +71,64 @@ def compute_metrics(G):
         metrics["largest_component"] = None
         metrics["avg_shortest_path"] = None
 
-    # centralities (author projection assumed)
-    try:
-        dc = nx.degree_centrality(G)
-        metrics["max_degree_centrality"] = float(max(dc.values())) if dc else 0.0
-    except Exception:
-        metrics["max_degree_centrality"] = None
+    # degree centrality = degree / (n - 1), as nx.degree_centrality
+    metrics["max_degree_centrality"] = float(degs.max() / (n - 1)) if n > 1 else 1.0
 
     return metrics
 
 
-def top_influencers_by_centrality(P, topk=10):
-    """Return top-k authors by degree centrality and by weighted degree"""
+def top_influencers_by_centrality(P, authors, topk=10):
+    """Return top-k authors by degree centrality and by weighted degree.
+    P is the sparse author projection and authors[i] labels its row i."""
     results = []
-    if P.number_of_nodes() == 0:
+    n = P.shape[0]
+    if n == 0:
         return results
-    deg_cent = nx.degree_centrality(P)
-    weighted_deg = {n: d for n, d in P.degree(weight="weight")}
-    for n in sorted(P.nodes(), key=lambda x: deg_cent.get(x, 0), reverse=True)[:topk]:
+    deg = np.diff(P.indptr)
+    wdeg = np.asarray(P.sum(axis=1)).ravel()
+    deg_cent = deg / (n - 1) if n > 1 else np.ones(n)
+    # degree, then weighted degree; rows are in author-name order, so remaining ties go by name
+    idx = np.lexsort((np.arange(n), -wdeg, -deg))[:topk]
+    for i in idx:
         results.append({
-            "author": n,
-            "degree_centrality": float(deg_cent.get(n, 0)),
-            "weighted_degree": float(weighted_deg.get(n, 0))
+            "author": authors[i],
+            "degree_centrality": float(deg_cent[i]),
+            "weighted_degree": float(wdeg[i])
         })
     return results
 
 
-def analyze_per_content(df):
+def _analyze_category(label, edges, authors_all, subs, mask):
+    """Metrics and top influencers for one category (mask over the shared edge table)."""
+    B, authors = edges_to_csr(edges, authors_all, subs, mask)
+    P = project_authors(B)
+    rows = [{"category": label, **inf} for inf in top_influencers_by_centrality(P, authors, topk=10)]
+    return compute_metrics(P), rows
+
+
+def analyze_per_content(df, max_workers=None):
     summary = {}
     influencers_rows = []
-    # overall
-    G_all = build_bipartite_graph(df)
-    P_all = project_authors(G_all)
-    summary["all"] = compute_metrics(P_all)
-    for inf in top_influencers_by_centrality(P_all, topk=10):
-        inf_row = {"category": "all", **inf}
-        influencers_rows.append(inf_row)
-
-    for ctype in sorted(df.get("content_type", pd.Series(["unknown"])).fillna("unknown").unique()):
-        subdf = df[df["content_type"] == ctype]
-        G = build_bipartite_graph(subdf)
-        P = project_authors(G)
-        summary[ctype] = compute_metrics(P)
-        for inf in top_influencers_by_centrality(P, topk=10):
-            inf_row = {"category": ctype, **inf}
-            influencers_rows.append(inf_row)
+    # index authors/subreddits once; each category is a row mask over the same edge table
+    edges, authors_all, subs = build_edge_index(df, by="content_type")
+    categories = [("all", None)]
+    for ctype in sorted(edges["content_type"].unique()):
+        categories.append((ctype, (edges["content_type"] == ctype).to_numpy()))
+
+    # categories are independent and the heavy lifting is in scipy/numpy kernels,
+    # so threads share the edge table without pickling it to worker processes
+    with ThreadPoolExecutor(max_workers=max_workers or len(categories)) as pool:
+        futures = [pool.submit(_analyze_category, label, edges, authors_all, subs, mask)
+                   for label, mask in categories]
+        for (label, _), fut in zip(categories, futures):
+            summary[label], rows = fut.result()
+            influencers_rows.extend(rows)
 
     return summary, influencers_rows
 
 
 def main():
-    df = load_processed()
-    if "content_type" not in df.columns:
-        df["content_type"] = df.get("source_file", "").astype(str).apply(lambda x: "unknown")
+    df = load_combined_df()
 
     summary, influencers = analyze_per_content(df)
 
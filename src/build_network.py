@@ -13,35 +13,20 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 # ------------------------------------------------------
 
-import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
-from src.config import PROC_DIR
-
-
-def load_data():
-    """Load all processed CSVs from data/processed."""
-    csvs = list(PROC_DIR.glob("*_clean.csv"))
-    if not csvs:
-        raise SystemExit("No processed CSV files found. Run reddit_scrape.py first.")
-    dfs = []
-    for f in csvs:
-        df = pd.read_csv(f)
-        df["source_file"] = f.name
-        dfs.append(df)
-    return pd.concat(dfs, ignore_index=True)
+from src._io import load_combined_df
+from src._graph import build_bipartite_csr
 
 
 def build_network(df):
     """Build a bipartite graph: authors ↔ subreddits."""
+    B, authors, subs = build_bipartite_csr(df)
+    coo = B.tocoo()
     G = nx.Graph()
-    for _, row in df.iterrows():
-        author = row["user_username"]
-        subreddit = row["subreddit"]
-        if pd.notna(author) and pd.notna(subreddit):
-            G.add_node(author, type="author")
-            G.add_node(subreddit, type="subreddit")
-            G.add_edge(author, subreddit, weight=row["likeCount"])
+    G.add_nodes_from(authors, type="author")
+    G.add_nodes_from(subs, type="subreddit")
+    G.add_weighted_edges_from(zip(authors[coo.row], subs[coo.col], coo.data))
     return G
 
 
@@ -65,7 +50,7 @@ def visualize_network(G):
 
 
 def main():
-    df = load_data()
+    df = load_combined_df()
     print(f"Loaded {len(df)} posts from {df['source_file'].nunique()} files.")
     G = build_network(df)
     print(f"Graph: {len(G.nodes())} nodes, {len(G.edges())} edges.")
@@ -1,6 +1,6 @@
 # src/interactive_plotly.py
 """
-Interactive network visualization using Plotly (produces a standalone HTML file).
+Interactive network visualization using Plotly (produces an HTML file that loads plotly.js from its CDN).
 - Selects top_k authors by weighted degree from the author-author projection.
 - Draws edges as thin lines and nodes as scatter points with hover tooltips.
 - Writes HTML to data/processed/network_plotly.html
@@ -8,10 +8,11 @@ Interactive network visualization using Plotly (produces a standalone HTML file)
 
 import sys
 from pathlib import Path
-import math
+import numpy as np
 import pandas as pd
-import networkx as nx
 import plotly.graph_objects as go
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, eigsh
 
 # ensure project root on path
 ROOT = Path(__file__).resolve().parents[1]
@@ -19,79 +20,97 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src.config import PROC_DIR
+from src._io import load_combined_df
+from src._graph import build_bipartite_csr, project_authors, projected_weighted_degree
 
 OUT_HTML = Path(PROC_DIR) / "network_plotly.html"
 
-def load_processed_df():
-    csvs = list(Path(PROC_DIR).glob("*_clean.csv"))
-    if not csvs:
-        raise SystemExit("No processed CSVs found. Run scraping step first.")
-    dfs = []
-    for p in csvs:
-        df = pd.read_csv(p)
-        df['source_file'] = p.name
-        dfs.append(df)
-    df = pd.concat(dfs, ignore_index=True)
-    # normalize keys
-    if "user_username" not in df.columns and "user.username" in df.columns:
-        df = df.rename(columns={"user.username": "user_username"})
-    if "likeCount" not in df.columns and "like_count" in df.columns:
-        df = df.rename(columns={"like_count": "likeCount"})
-    df["content_type"] = df.get("content_type", df.get("type", "unknown")).fillna("unknown")
-    return df
-
-def build_author_projection(df):
-    # build bipartite author-sub graph and project to authors
-    B = nx.Graph()
-    for _, row in df.iterrows():
-        a = row.get("user_username")
-        s = row.get("subreddit")
-        if pd.isna(a) or pd.isna(s):
-            continue
-        if not B.has_node(a):
-            B.add_node(a, bipartite='author')
-        if not B.has_node(s):
-            B.add_node(s, bipartite='subreddit')
-        w = 1.0
-        if 'likeCount' in row and not pd.isna(row['likeCount']):
-            try:
-                w = float(row['likeCount'])
-            except Exception:
-                w = 1.0
-        if B.has_edge(a, s):
-            B[a][s]['weight'] += w
-        else:
-            B.add_edge(a, s, weight=w)
-    authors = [n for n,d in B.nodes(data=True) if d.get('bipartite') == 'author']
-    if not authors:
-        return nx.Graph()
-    P = nx.bipartite.weighted_projected_graph(B, authors)
-    return P
+# node colour per dominant content_type; anything else falls back to grey
+CMAP = {
+    'meme': '#1f77b4', 'hashtag': '#ff7f0e',
+    'misinformation': '#d62728', 'unknown':'#2ca02c'
+}
+PALETTE = np.array(list(CMAP.values()) + ['#7f7f7f'])
+
+def spectral_layout(A, seed=42):
+    """2-D positions from the leading non-trivial eigenvectors of the normalized adjacency of
+    the sparse, symmetric A (= smallest of the normalized Laplacian).
+    Returns an (n, 2) array aligned with the rows of A, scaled to [-1, 1]."""
+    n = A.shape[0]
+    if n < 3:
+        pos = np.zeros((n, 2))
+        pos[:, 0] = np.linspace(-1, 1, n) if n > 1 else 0.0
+        return pos
+    A = sparse.csr_matrix(A, dtype=float)
+    deg = np.asarray(A.sum(axis=1)).ravel()
+    # regularize with a uniform tau on every pair so disconnected components get separate regions
+    tau = max(deg.mean(), 1.0) / n
+    d = 1.0 / np.sqrt(deg + tau * n)
+    if n <= 500:
+        vals, vecs = np.linalg.eigh(d[:, None] * (A.toarray() + tau) * d[None, :])
+    else:
+        M = LinearOperator((n, n), dtype=float, matvec=lambda x: d * (A @ (d * x) + tau * (d * x).sum()))
+        vals, vecs = eigsh(M, k=3, which="LA", v0=np.random.default_rng(seed).random(n))
+    # skip the trivial top eigenvector, map back to random-walk eigenvectors
+    xy = vecs[:, np.argsort(vals)[::-1][1:3]] * d[:, None]
+    xy -= xy.mean(axis=0)
+    lim = np.abs(xy).max()
+    return xy / lim if lim > 0 else xy
+
+def spread_layout(xy, A, iterations=50, seed=42):
+    """Refine a starting layout (e.g. spectral_layout) with vectorized Fruchterman-Reingold steps:
+    all-pairs repulsion plus attraction along the edges of the sparse, symmetric A.
+    Nodes with identical rows of A share their spectral coordinates; a small seeded jitter
+    separates them and the repulsion keeps them apart. Returns an (n, 2) array scaled to [-1, 1]."""
+    n = len(xy)
+    if n < 2:
+        return np.asarray(xy, dtype=float)
+    pos = xy + np.random.default_rng(seed).uniform(-0.01, 0.01, size=xy.shape)
+    k = np.sqrt(4.0 / n)  # ideal edge length for n nodes in the [-1, 1] square
+    A = sparse.coo_matrix(A)
+    u, v = A.row, A.col
+    t = 0.1
+    for _ in range(iterations):
+        # repulsion k^2 / d between every pair (per axis, so only (n, n) temporaries),
+        # attraction d^2 / k along each edge
+        dx = pos[:, 0, None] - pos[None, :, 0]
+        dy = pos[:, 1, None] - pos[None, :, 1]
+        f = k * k / np.maximum(dx * dx + dy * dy, 1e-6)
+        disp = np.column_stack(((dx * f).sum(axis=1), (dy * f).sum(axis=1)))
+        e = pos[u] - pos[v]
+        np.add.at(disp, u, -e * (np.linalg.norm(e, axis=1) / k)[:, None])
+        # cap each step at the current temperature, which cools linearly
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        pos += disp * (np.minimum(length, t) / length)[:, None]
+        t -= 0.1 / (iterations + 1)
+    pos -= pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    return pos / lim if lim > 0 else pos
 
 def make_plot(top_k=150):
-    df = load_processed_df()
-    P = build_author_projection(df)
-    if P.number_of_nodes() == 0:
+    df = load_combined_df()
+    B, authors, _ = build_bipartite_csr(df)
+    if B.shape[0] == 0:
         print("Author projection empty.")
         return
 
-    # compute weighted degree and keep top_k
-    wdeg = dict(P.degree(weight='weight'))
-    top_nodes = sorted(wdeg.items(), key=lambda x: x[1], reverse=True)[:top_k]
-    top_set = {n for n,_ in top_nodes}
-    subP = P.subgraph(top_set).copy()
+    # compute weighted degree and keep top_k; only the top_k rows are ever projected
+    wdeg_all = projected_weighted_degree(B)
+    # ties at the cut-off go by row, i.e. author-name order, so the plotted set is reproducible
+    top = np.lexsort((np.arange(len(wdeg_all)), -wdeg_all))[:top_k]
+    nodes = authors[top]
+    sub = project_authors(B[top])
 
-    # layout (force-directed). Use spring_layout for positions
-    pos = nx.spring_layout(subP, k=0.5, iterations=200, seed=42)
+    # layout: spectral start on the sparse top_k subgraph, spread by force-directed steps;
+    # xy rows are aligned with nodes
+    xy = spread_layout(spectral_layout(sub), sub)
 
-    # prepare edge traces
-    edge_x = []
-    edge_y = []
-    for u, v, d in subP.edges(data=True):
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
+    # prepare edge traces: x0, x1, NaN per edge (NaN breaks the line between edges)
+    u, v = sparse.triu(sub, k=1).nonzero()
+    edge_x = np.full(3 * len(u), np.nan)
+    edge_y = np.full(3 * len(u), np.nan)
+    edge_x[0::3], edge_x[1::3] = xy[u, 0], xy[v, 0]
+    edge_y[0::3], edge_y[1::3] = xy[u, 1], xy[v, 1]
 
     # edge trace (single trace)
     edge_trace = go.Scatter(
@@ -101,39 +120,25 @@ def make_plot(top_k=150):
         mode='lines'
     )
 
-    # node traces
-    node_x = []
-    node_y = []
-    texts = []
-    sizes = []
-    colors = []
+    # node traces: per-node attributes as arrays aligned with nodes
     # compute dominant content_type per author
-    dominant = df.groupby(['user_username','content_type']).size().reset_index(name='cnt')
-    dominant = dominant.loc[dominant.groupby('user_username')['cnt'].idxmax()].set_index('user_username')['content_type'].to_dict()
-    posts_count = df.groupby('user_username').size().to_dict()
-
-    for n in subP.nodes():
-        x,y = pos[n]
-        node_x.append(x)
-        node_y.append(y)
-        degw = wdeg.get(n, 0.0)
-        sz = 8 + math.log1p(degw) * 8
-        sizes.append(sz)
-        ctype = dominant.get(n, 'unknown')
-        cmap = {
-            'meme': '#1f77b4', 'hashtag': '#ff7f0e',
-            'misinformation': '#d62728', 'unknown':'#2ca02c'
-        }
-        colors.append(cmap.get(ctype, '#7f7f7f'))
-        texts.append(f"{n}<br>weighted_degree: {degw:.1f}<br>posts: {posts_count.get(n,0)}<br>dominant: {ctype}")
+    dominant = pd.crosstab(df['user_username'], df['content_type']).idxmax(axis=1)
+    ctypes = dominant.reindex(nodes).astype(object).fillna('unknown').to_numpy()
+    posts = df['user_username'].value_counts().reindex(nodes, fill_value=0).to_numpy()
+    wdeg = wdeg_all[top]
+    sizes = 8 + np.log1p(wdeg) * 8
+    # content types missing from CMAP index -1, i.e. the trailing grey of PALETTE
+    colors = PALETTE[pd.Index(list(CMAP)).get_indexer(ctypes)]
+    texts = [f"{n}<br>weighted_degree: {degw:.1f}<br>posts: {p}<br>dominant: {c}"
+             for n, degw, p, c in zip(nodes, wdeg, posts, ctypes)]
 
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=xy[:, 0], y=xy[:, 1],
         mode='markers',
         hoverinfo='text',
         text=texts,
         marker=dict(
-            # colors is a list of color strings; Plotly will accept this
+            # colors is an array of color strings; Plotly will accept this
             color=colors,
             size=sizes,
             line=dict(width=1, color='#333')
@@ -151,7 +156,9 @@ def make_plot(top_k=150):
                         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
                     ))
     OUT_HTML.parent.mkdir(parents=True, exist_ok=True)
-    fig.write_html(str(OUT_HTML), auto_open=False)
+    # load plotly.js from the CDN instead of inlining the multi-MB bundle into every write
+    fig.write_html(str(OUT_HTML), auto_open=False, include_plotlyjs='cdn', full_html=True,
+                   config={'displaylogo': False})
     print("Wrote interactive Plotly HTML to:", OUT_HTML)
 
 if __name__ == '__main__':
@@ -1,18 +1,24 @@
 # src/reddit_scrape.py
 """
 Reddit scraper using PRAW that reads credentials from .env and queries from src.config.
-Saves raw JSONL to data/raw/<name>.jsonl and a processed CSV to data/processed/<name>_clean.csv.
+Saves raw JSONL to data/raw/<name>.jsonl and a processed CSV to data/processed/<name>_clean.csv
+(plus a <name>_clean.parquet copy that the analysis scripts load faster).
 """
 
 import sys
 from pathlib import Path
 import os
 import json
-import csv
 import time
+import pandas as pd
 from dotenv import load_dotenv
 import praw
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 # Add project root to sys.path to allow importing src.config
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -48,24 +54,30 @@ reddit = praw.Reddit(
 )
 
 
+def _dumps(obj) -> bytes:
+    """Encode one record as UTF-8 JSON (orjson when installed, else stdlib json)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 def save_jsonl(items, out_path: Path):
     """Save raw data to a JSONL file."""
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as fh:
+    with out_path.open("wb") as fh:
         for it in items:
-            fh.write(json.dumps(it, ensure_ascii=False) + "\n")
+            fh.write(_dumps(it) + b"\n")
     print(f"Wrote raw jsonl -> {out_path}")
 
 
 def save_csv(rows, out_csv: Path):
-    """Save cleaned data to CSV for later processing."""
+    """Save cleaned data to CSV (plus a parquet copy next to it) for later processing."""
     out_csv.parent.mkdir(parents=True, exist_ok=True)
     fieldnames = ["id", "date", "content", "user_username", "replyCount", "likeCount", "subreddit", "content_type"]
-    with out_csv.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"Wrote processed csv -> {out_csv}")
+    df = pd.DataFrame(rows, columns=fieldnames)
+    df.to_csv(out_csv, index=False)
+    df.to_parquet(out_csv.with_suffix(".parquet"), index=False)
+    print(f"Wrote processed csv -> {out_csv} (+ .parquet)")
 
 
 def scrape_query(query, limit):
@@ -74,15 +86,18 @@ def scrape_query(query, limit):
     items = []
     rows = []
     try:
+        # search pages already carry every field read below; only read fields that are in the
+        # listing (display_name / name rather than anything that would fetch the full object)
         for i, submission in enumerate(reddit.subreddit("all").search(query, limit=limit)):
+            author = submission.author
             raw = {
                 "id": submission.id,
                 "created_utc": int(submission.created_utc),
                 "title": submission.title,
                 "selftext": submission.selftext or "",
                 "url": submission.url,
-                "subreddit": str(submission.subreddit),
-                "author": str(submission.author) if submission.author else None,
+                "subreddit": submission.subreddit.display_name,
+                "author": author.name if author else None,
                 "score": submission.score,
                 "num_comments": submission.num_comments,
             }